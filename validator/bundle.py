@@ -1,4 +1,5 @@
 import json
+import sys
 from dataclasses import (
     dataclass,
     field,
@@ -53,6 +54,7 @@ class Bundle:
     _schema_to_graphql_type: dict[str, GraphqlType] = field(init=False)
     _top_level_schemas: set[str] = field(init=False)
     _graphql_type_by_name: dict[str, GraphqlType] = field(init=False)
+    _unique_field_names: dict[str, tuple[str, ...]] = field(init=False)
 
     def __post_init__(self):  # noqa: D105
         if isinstance(self.graphql, dict) and (
@@ -89,6 +91,19 @@ class Bundle:
             for f in self._graphql_type_by_name["Query"].spec["fields"]
             if f.get("datafileSchema")
         }
+        # fields flagged with isUnique on the graphql types of top level schemas
+        datafile_schema_by_type = {
+            f["type"]: f["datafileSchema"]
+            for f in self._graphql_type_by_name["Query"].spec["fields"]
+            if "datafileSchema" in f
+        }
+        self._unique_field_names = {
+            datafile_schema_by_type[t.type]: tuple(
+                f["name"] for f in t.spec["fields"] if f.get("isUnique")
+            )
+            for t in self._graphql_type_by_name.values()
+            if t.type != "Query" and datafile_schema_by_type.get(t.type)
+        }
 
     def to_dict(self):
         return {
@@ -112,9 +127,19 @@ class Bundle:
     def is_top_level_schema(self, datafile_schema: str) -> bool:
         return datafile_schema in self._top_level_schemas
 
+    def get_unique_field_names(self, datafile_schema: str) -> tuple[str, ...]:
+        return self._unique_field_names.get(datafile_schema, ())
+
 
 def load_bundle(bundle_source: IO) -> Bundle:
     bundle_data = json.load(bundle_source)
+    # thousands of datafiles share a few hundred $schema urls. interned, they
+    # compare by identity in schema lookups and are pickled only once when
+    # the bundle is shipped to process pool workers
+    for datafile in bundle_data["data"].values():
+        schema_url = datafile.get("$schema")
+        if isinstance(schema_url, str):
+            datafile["$schema"] = sys.intern(schema_url)
     return Bundle(
         data=bundle_data["data"],
         graphql=bundle_data["graphql"],
@@ -1,4 +1,10 @@
+import json
+
+import pytest
+from click.testing import CliRunner
+
 from validator import validator
+from validator.bundle import Bundle
 from validator.test.fixtures import Fixtures
 
 
@@ -40,3 +46,297 @@ class TestGetSchemaInfoFromPointer:
 
     def test_external_ref_obj_oneof(self):
         self.do_fxt_test("external_ref_obj_oneof.yml")
+
+
+@pytest.fixture
+def bundle() -> Bundle:
+    fxt = Fixtures("validate_bundle")
+    fixture = fxt.get_anymarkup(fxt.path("bundle.yml"))
+    return Bundle(
+        git_commit="c",
+        git_commit_timestamp="t",
+        schemas=fixture["schemas"],
+        graphql=fixture["graphql"],
+        data=fixture["data"],
+        resources=fixture["resources"],
+    )
+
+
+@pytest.mark.parametrize("process_pool_size", [1, 2])
+def test_validate_bundle(bundle: Bundle, process_pool_size: int):
+    fxt = Fixtures("validate_bundle")
+    expected = fxt.get_anymarkup(fxt.path("result.yml"))
+
+    assert validator.validate_bundle(bundle, process_pool_size) == expected
+
+
+@pytest.mark.parametrize("process_pool_size", [1, 2])
+def test_validate_bundle_only_errors(bundle: Bundle, process_pool_size: int):
+    fxt = Fixtures("validate_bundle")
+    expected = [
+        r
+        for r in fxt.get_anymarkup(fxt.path("result.yml"))
+        if r["result"]["status"] == "ERROR"
+    ]
+
+    assert (
+        validator.validate_bundle(bundle, process_pool_size, only_errors=True)
+        == expected
+    )
+
+
+def test_validator_cache_reuses_validators(bundle: Bundle):
+    validators = validator.ValidatorCache(bundle.schemas)
+    schema = bundle.schemas["/app-1.yml"]
+
+    assert validators.get("/app-1.yml", schema) is validators.get("/app-1.yml", schema)
+
+
+def test_validator_cache_schema_infos(bundle: Bundle):
+    validators = validator.ValidatorCache(bundle.schemas)
+    schema = bundle.schemas["/app-1.yml"]
+
+    schema_infos = validators.get_schema_infos("/app-1.yml", schema, "/reviewers/0")
+    assert schema_infos == [schema["properties"]["reviewers"]["items"]]
+    assert (
+        validators.get_schema_infos("/app-1.yml", schema, "/reviewers/1")
+        is schema_infos
+    )
+
+
+def test_bundle_unique_field_names(bundle: Bundle):
+    assert bundle.get_unique_field_names("/app-1.yml") == ("name",)
+    assert not bundle.get_unique_field_names("/user-1.yml")
+    assert not bundle.get_unique_field_names("/missing-1.yml")
+
+
+def test_validate_unique_fields_unhashable_values(bundle: Bundle):
+    bundle.data["/apps/a.yml"]["name"] = {"first": "a", "last": "b"}
+    bundle.data["/apps/b.yml"]["name"] = {"last": "b", "first": "a"}
+    bundle.data["/apps/c.yml"]["name"] = ["a", "b"]
+
+    results = validator.validate_unique_fields(bundle)
+
+    assert [r["filename"] for r in results] == ["/apps/a.yml"]
+
+
+@pytest.fixture
+def bundle_file(tmp_path):
+    fxt = Fixtures("validate_bundle")
+    fixture = fxt.get_anymarkup(fxt.path("bundle.yml"))
+    path = tmp_path / "bundle.json"
+    path.write_text(
+        json.dumps({**fixture, "git_commit": "c", "git_commit_timestamp": "t"}),
+        encoding="utf-8",
+    )
+    return path
+
+
+@pytest.mark.parametrize("only_errors", [False, True])
+def test_main(bundle_file, only_errors):
+    fxt = Fixtures("validate_bundle")
+    expected = fxt.get_anymarkup(fxt.path("result.yml"))
+    if only_errors:
+        expected = [r for r in expected if r["result"]["status"] == "ERROR"]
+
+    args = [str(bundle_file)]
+    if only_errors:
+        args.insert(0, "--only-errors")
+    result = CliRunner().invoke(validator.main, args)
+
+    assert result.exit_code == 1
+    assert result.stdout == json.dumps(expected, indent=4) + "\n"
+
+
+def test_main_closes_output_on_failure(bundle_file, monkeypatch):
+    def iter_validate_bundle(*_args, **_kwargs):
+        yield {"filename": "/a.yml", "result": {"status": "ERROR"}}
+        path = "/meta-1.json"
+        raise validator.MissingSchemaFileError(path)
+
+    monkeypatch.setattr(validator, "iter_validate_bundle", iter_validate_bundle)
+    result = CliRunner().invoke(validator.main, [str(bundle_file)])
+
+    assert isinstance(result.exception, validator.MissingSchemaFileError)
+    assert json.loads(result.stdout) == [
+        {"filename": "/a.yml", "result": {"status": "ERROR"}}
+    ]
+
+
+class FakeResponse:
+    def __init__(self, status_code, content=b"", headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        pass
+
+
+class FakeRequests:
+    def __init__(self, response):
+        self.response = response
+        self.headers = []
+
+    def get(self, _url, headers, **_kwargs):
+        self.headers.append(headers)
+        return self.response
+
+
+@pytest.fixture
+def schema_cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("QONTRACT_VALIDATOR_CACHE_DIR", str(tmp_path))
+    validator.fetch_schema.cache_clear()
+    yield tmp_path
+    validator.fetch_schema.cache_clear()
+
+
+@pytest.mark.usefixtures("schema_cache_dir")
+class TestFetchSchema:
+    url = "https://example.com/schema.json"
+
+    def test_fetch_schema_disk_cache(self, monkeypatch):
+        fake = FakeRequests(FakeResponse(200, b'{"type": "object"}'))
+        monkeypatch.setattr(validator.requests, "get", fake.get)
+
+        assert validator.fetch_schema(self.url) == {"type": "object"}
+        validator.fetch_schema.cache_clear()
+        assert validator.fetch_schema(self.url) == {"type": "object"}
+        assert fake.headers == [{}]
+
+    def test_fetch_schema_revalidate_expired(self, monkeypatch):
+        fake = FakeRequests(FakeResponse(200, b'{"type": "object"}', {"ETag": '"abc"'}))
+        monkeypatch.setattr(validator.requests, "get", fake.get)
+        validator.fetch_schema(self.url)
+        validator.fetch_schema.cache_clear()
+
+        fake = FakeRequests(FakeResponse(304))
+        monkeypatch.setattr(validator.requests, "get", fake.get)
+        monkeypatch.setattr(validator, "SCHEMA_CACHE_MAX_AGE", -1)
+        assert validator.fetch_schema(self.url) == {"type": "object"}
+        assert fake.headers == [{"If-None-Match": '"abc"'}]
+
+
+@pytest.mark.parametrize(
+    ("schema_url", "expected"),
+    [
+        ("/app-1.yml", "/app-1.yml"),
+        ("app-1.yml", "/app-1.yml"),
+        ("https://example.com/schema.json", "https://example.com/schema.json"),
+    ],
+)
+def test_normalize_schema_url(schema_url, expected):
+    assert validator.normalize_schema_url(schema_url) == expected
+
+
+def test_find_refs():
+    data = {
+        "$schema": "/app-1.yml",
+        "owner": {"$ref": "/users/u.yml"},
+        "labels": {"a": "b"},
+        "reviewers": [{"$ref": "/users/u.yml"}, "x", {"$ref": "/users/w.yml"}],
+        "nested": {"list": [[{"$ref": "/a.yml"}]], "ref": {"$ref": "/b.yml"}},
+    }
+
+    assert validator.find_refs(data) == [
+        ("/owner", {"$ref": "/users/u.yml"}),
+        ("/reviewers/0", {"$ref": "/users/u.yml"}),
+        ("/reviewers/2", {"$ref": "/users/w.yml"}),
+        ("/nested/list/0/0", {"$ref": "/a.yml"}),
+        ("/nested/ref", {"$ref": "/b.yml"}),
+    ]
+
+
+def test_validate_ref_schema_ref_object():
+    schemas_bundle = {
+        "/app-1.yml": {
+            "type": "object",
+            "properties": {"owner": {"$schemaRef": {"$ref": "/user-1.yml"}}},
+        },
+    }
+    bundle = {"/users/u.yml": {"$schema": "/user-1.yml", "name": "u"}}
+    data = {"$schema": "/app-1.yml", "owner": {"$ref": "/users/u.yml"}}
+
+    result = validator.validate_ref(
+        schemas_bundle, bundle, "/apps/a.yml", data, "/owner", data["owner"]
+    )
+
+    assert result.dump()["result"]["status"] == "OK"
+
+
+@pytest.mark.parametrize(
+    ("ref", "reason"),
+    [
+        ("/users/missing.yml", "FILE_NOT_FOUND"),
+        ("/users/u.yml", "SCHEMA_NOT_FOUND"),
+    ],
+)
+def test_validate_ref_without_schema(ref, reason):
+    bundle = {"/users/u.yml": {"$schema": "/user-1.yml", "name": "u"}}
+    data = {"owner": {"$ref": ref}}
+
+    result = validator.validate_ref(
+        {}, bundle, "/apps/a.yml", data, "/owner", data["owner"]
+    )
+
+    assert result.dump()["result"]["reason"] == reason
+
+
+@pytest.mark.parametrize(
+    ("schema_ref", "reason"),
+    [
+        ("/user-1.yml", "SCHEMA_REF_VALIDATION_ERROR"),
+        ("/missing-1.yml", "SCHEMA_ERROR"),
+    ],
+)
+def test_validate_ref_schema_ref_object_mismatch(schema_ref, reason):
+    schemas_bundle = {
+        "/app-1.yml": {
+            "type": "object",
+            "properties": {"owner": {"$schemaRef": {"$ref": schema_ref}}},
+        },
+        "/user-1.yml": {"type": "object", "required": ["name"]},
+    }
+    bundle = {"/groups/g.yml": {"$schema": "/group-1.yml"}}
+    data = {"$schema": "/app-1.yml", "owner": {"$ref": "/groups/g.yml"}}
+
+    results = validator.validate_ref(
+        schemas_bundle, bundle, "/apps/a.yml", data, "/owner", data["owner"]
+    )
+
+    assert [r.dump()["result"]["reason"] for r in results] == [reason]
+
+
+@pytest.mark.parametrize(
+    ("content", "kind"),
+    [
+        ("$schema: /user-1.yml\nname: u\n", "FILE"),
+        ("---\n$schema: /user-1.yml\nname: u\n", "FILE"),
+        ('{"name": "u", "$schema": "/user-1.yml"}', "FILE"),
+        ("\ufeff$schema: /user-1.yml\nfoo: 1\n", "FILE"),
+        ("foo: 1\r$schema: /user-1.yml\r", "FILE"),
+        ("&a $schema: /user-1.yml\nfoo: 1\n", "FILE"),
+        ("!!str $schema: /user-1.yml\nfoo: 1\n", "FILE"),
+        ("? $schema\n: /user-1.yml\nfoo: 1\n", "FILE"),
+        ("foo: {bar: 1, $schema: /user-1.yml}\n", "FILE"),
+        ("name: u\n", "NONE"),
+        ("Set the `$schema` field of the datafile.\n", "NONE"),
+        ("description: see $schema: in the docs\n", "NONE"),
+    ],
+)
+def test_validate_resource_schema_detection(content, kind):
+    schemas_bundle = {"/user-1.yml": {"type": "object"}}
+
+    result = validator.validate_resource(
+        schemas_bundle, "/resources/r.yml", {"content": content}
+    )
+
+    assert result.dump()["kind"] == kind
+
+
+def test_validate_resource_schema_detection_blank_lines():
+    content = "description: see $schema\n" + "\r\n" * 40000
+
+    result = validator.validate_resource({}, "/resources/r.yml", {"content": content})
+
+    assert result.dump()["kind"] == "NONE"
@@ -4,6 +4,10 @@ from pathlib import Path
 
 import yaml
 
+# libyaml-backed loader when available, it is considerably faster than the
+# pure python one when bundling thousands of small files
+SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 def parse_anymarkup_file(filename, calc_checksum=None):
     if calc_checksum is None:
@@ -36,7 +40,7 @@ def _load_json(data):
 
 
 def _load_yaml(data):
-    return yaml.safe_load(data)
+    return yaml.load(data, Loader=SafeLoader)  # noqa: S506
 
 
 def _checksum(data):